@@ -70,7 +70,7 @@ socket_timeout = None
 dry_run = None
 
 # keep and cutoff date; only recordings from this date on are downloaded and kept
-keep_re = re.compile(r"""(?P<range>\d+)(?P<unit>[dw]?)""")
+keep_units = ("d", "w")
 cutoff_date = None
 
 # for unit testing
@@ -80,19 +80,21 @@ today = datetime.date.today()
 def calc_cutoff_date(keep):
     """given a retention period, calculates the date before which files should be deleted"""
 
-    keep_match = re.fullmatch(keep_re, keep)
+    # <number>[dw]; the unit is optional and defaults to days
+    if keep.endswith(keep_units):
+        keep_number, keep_unit = keep[:-1], keep[-1]
+    else:
+        keep_number, keep_unit = keep, "d"
 
-    if keep_match is None:
+    if not keep_number.isdecimal():
         raise RuntimeError("KEEP must be in the format <number>[dw]")
 
-    keep_range = int(keep_match.group("range"))
+    keep_range = int(keep_number)
 
     if keep_range < 1:
         raise RuntimeError("KEEP must be greater than one.")
 
-    keep_unit = keep_match.group("unit") or "d"
-
-    if keep_unit == "d" or keep_unit is None:
+    if keep_unit == "d":
         keep_range_timedelta = datetime.timedelta(days=keep_range)
     elif keep_unit == "w":
         keep_range_timedelta = datetime.timedelta(weeks=keep_range)
@@ -135,23 +137,17 @@ filename_re = re.compile(r"""(?P<base_filename>(?P<year>\d\d\d\d)(?P<month>\d\d)
 
 def to_recording(filename, grouping):
     """extracts recording information from a filename"""
-    filename_match = re.fullmatch(filename_re, filename)
+    filename_match = filename_re.fullmatch(filename)
 
     if filename_match is None:
         return None
 
-    year = int(filename_match.group("year"))
-    month = int(filename_match.group("month"))
-    day = int(filename_match.group("day"))
-    hour = int(filename_match.group("hour"))
-    minute = int(filename_match.group("minute"))
-    second = int(filename_match.group("second"))
-    recording_datetime = datetime.datetime(year, month, day, hour, minute, second)
+    (recording_base_filename, year, month, day, hour, minute, second, recording_type,
+     recording_direction) = filename_match.group("base_filename", "year", "month", "day", "hour", "minute", "second",
+                                                 "type", "direction")
 
-    recording_base_filename = filename_match.group("base_filename")
+    recording_datetime = datetime.datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
     recording_group_name = get_group_name(recording_datetime, grouping)
-    recording_type = filename_match.group("type")
-    recording_direction = filename_match.group("direction")
 
     return Recording(filename, recording_base_filename, recording_group_name, recording_datetime, recording_type,
                      recording_direction)
@@ -165,7 +161,7 @@ def get_filenames(file_lines):
     """extracts the recording filenames from the lines returned by the dashcam index page"""
     filenames = []
     for file_line in file_lines:
-        file_line_match = re.fullmatch(file_line_re, file_line)
+        file_line_match = file_line_re.fullmatch(file_line)
         # the first line is "v:1.00", which won't match, so we skip it
         if file_line_match:
             filenames.append(file_line_match.group("filename"))
@@ -390,20 +386,15 @@ downloaded_filename_re = re.compile(r"""^(?P<base_filename>(?P<year>\d\d\d\d)(?P
 
 def to_downloaded_recording(filename, grouping):
     """extracts destination recording information from a filename"""
-    filename_match = re.match(downloaded_filename_re, filename)
+    filename_match = downloaded_filename_re.match(filename)
 
     if filename_match is None:
         return None
 
-    year = int(filename_match.group("year"))
-    month = int(filename_match.group("month"))
-    day = int(filename_match.group("day"))
-    hour = int(filename_match.group("hour"))
-    minute = int(filename_match.group("minute"))
-    second = int(filename_match.group("second"))
-    recording_datetime = datetime.datetime(year, month, day, hour, minute, second)
+    (recording_base_filename, year, month, day, hour, minute,
+     second) = filename_match.group("base_filename", "year", "month", "day", "hour", "minute", "second")
 
-    recording_base_filename = filename_match.group("base_filename")
+    recording_datetime = datetime.datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
     recording_group_name = get_group_name(recording_datetime, grouping)
 
     return DownloadedRecording(recording_base_filename, recording_group_name, recording_datetime)
@@ -420,9 +411,14 @@ def get_downloaded_recordings(destination, grouping):
     downloaded_filepath_glob = get_filepath(destination, group_name_glob, downloaded_filename_glob)
 
     downloaded_filepaths = glob.glob(downloaded_filepath_glob)
+    downloaded_recordings = (to_downloaded_recording(os.path.basename(p), grouping) for p in downloaded_filepaths)
+
+    return {r for r in downloaded_recordings if r is not None}
 
-    return set([r for r in [to_downloaded_recording(os.path.basename(p), grouping) for p in downloaded_filepaths]
-                if r is not None])
+
+def get_cutoff_datetime():
+    """returns the start of the cutoff date, so that recording datetimes can be compared with it directly"""
+    return datetime.datetime.combine(cutoff_date, datetime.time())
 
 
 def get_outdated_recordings(destination, grouping):
@@ -431,19 +427,30 @@ def get_outdated_recordings(destination, grouping):
         return []
 
     downloaded_recordings = get_downloaded_recordings(destination, grouping)
+    cutoff_datetime = get_cutoff_datetime()
 
-    return [x for x in downloaded_recordings if x.datetime.date() < cutoff_date]
+    return [x for x in downloaded_recordings if x.datetime < cutoff_datetime]
 
 
 def get_current_recordings(recordings):
     """returns the recordings that are after or on the cutoff date"""
-    return recordings if cutoff_date is None else [x for x in recordings if x.datetime.date() >= cutoff_date]
+    if cutoff_date is None:
+        return recordings
+
+    cutoff_datetime = get_cutoff_datetime()
+
+    return [x for x in recordings if x.datetime >= cutoff_datetime]
 
 
 def get_filtered_recordings(recordings, recording_filter):
     """returns recordings filtered by recording_filter """
-    return recordings if recording_filter is None else [x for x in recordings
-                                                        if "%s%s" % (x.type, x.direction) in recording_filter]
+    if recording_filter is None:
+        return recordings
+
+    # type and direction pairs to keep, e.g. {"PF", "PR"}
+    recording_filter = frozenset(recording_filter)
+
+    return [x for x in recordings if x.type + x.direction in recording_filter]
 
 
 def ensure_destination(destination):
@@ -522,7 +529,7 @@ def clean_destination(destination, grouping):
 
     for temp_filepath in temp_filepaths:
         if not dry_run:
-            logger.debug("Removing temporary file : %s" % temp_filepath)
+            logger.debug("Removing temporary file : %s", temp_filepath)
             os.remove(temp_filepath)
         else:
             logger.debug("DRY RUN Would remove temporary file : %s", temp_filepath)
@@ -537,7 +544,7 @@ def clean_destination(destination, grouping):
         for group_filepath in group_filepaths:
             if is_empty_directory(group_filepath):
                 if not dry_run:
-                    logger.debug("Removing grouping directory : %s" % group_filepath)
+                    logger.debug("Removing grouping directory : %s", group_filepath)
                     shutil.rmtree(group_filepath)
                 else:
                     logger.debug("DRY RUN Would remove grouping directory : %s", group_filepath)
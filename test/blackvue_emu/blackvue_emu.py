@@ -3,7 +3,11 @@ import flask
 
 from collections import namedtuple
 import datetime
-import re
+import functools
+import hashlib
+import itertools
+import mimetypes
+import os
 
 
 app = flask.Flask(__name__)
@@ -11,64 +15,114 @@ app = flask.Flask(__name__)
 # represents a recording: filename and metadata
 Recording = namedtuple("Recording", "filename base_filename datetime type direction extension")
 
-# dashcam filename pattern
-filename_re = re.compile(r"""(?P<base_filename>(?P<year>\d\d\d\d)(?P<month>\d\d)(?P<day>\d\d)
-    _(?P<hour>\d\d)(?P<minute>\d\d)(?P<second>\d\d))
-    _(?P<type>[NEPMIOATBRXG])
-    (?P<direction>[FR]?)
-    (?P<upload>[LS]?)
-    \.(?P<extension>(3gf|gps|mp4|thm))""", re.VERBOSE)
+# recording types, directions, upload flags and file extensions in dashcam filenames
+recording_types = frozenset("NEPMIOATBRXG")
+recording_directions = frozenset(["", "F", "R"])
+recording_uploads = frozenset(["", "L", "S"])
+recording_extensions = frozenset(["3gf", "gps", "mp4", "thm"])
 
+# length of the shortest valid filename, e.g. 20181029_131513_N.gps
+filename_min_length = 21
 
+
+@functools.lru_cache(maxsize=2048)
 def to_recording(filename):
     """extracts recording information from a filename"""
-    filename_match = re.fullmatch(filename_re, filename)
+    # filenames are fixed-width up to the flags: YYYYMMDD_HHMMSS_<type>[<direction>][<upload>].<extension>
+    if len(filename) < filename_min_length or filename[8] != "_" or filename[15] != "_":
+        return None
+
+    recording_digits = filename[0:8] + filename[9:15]
+    if not (recording_digits.isascii() and recording_digits.isdigit()):
+        return None
+
+    recording_flags, _, recording_extension = filename[16:].partition(".")
+    if recording_extension not in recording_extensions:
+        return None
 
-    if filename_match is None:
+    recording_type = recording_flags[:1]
+    recording_direction = recording_flags[1:2]
+    recording_upload = recording_flags[2:]
+    if recording_direction not in recording_directions:
+        # no direction, so the flag after the type is the upload flag
+        recording_direction, recording_upload = "", recording_flags[1:]
+
+    if recording_type not in recording_types or recording_upload not in recording_uploads:
         return None
 
-    year = int(filename_match.group("year"))
-    month = int(filename_match.group("month"))
-    day = int(filename_match.group("day"))
-    hour = int(filename_match.group("hour"))
-    minute = int(filename_match.group("minute"))
-    second = int(filename_match.group("second"))
-    recording_datetime = datetime.datetime(year, month, day, hour, minute, second)
+    recording_base_filename = filename[:15]
 
-    recording_base_filename = filename_match.group("base_filename")
-    recording_type = filename_match.group("type")
-    recording_direction = filename_match.group("direction")
-    recording_extension = filename_match.group("extension")
+    # YYYY-MM-DDTHH:MM:SS
+    recording_datetime = datetime.datetime.fromisoformat("%s-%s-%sT%s:%s:%s" % (
+        filename[0:4], filename[4:6], filename[6:8], filename[9:11], filename[11:13], filename[13:15]))
 
     return Recording(filename, recording_base_filename, recording_datetime, recording_type, recording_direction,
                      recording_extension)
 
 
+# recording filename suffixes generated each hour, with the minutes at which they're generated
+recording_suffixes = [
+    (range(10, 25, 3), ["_NF.mp4", "_NR.mp4"]),
+    (range(11, 25, 3), ["_EF.mp4", "_ER.mp4"]),
+    (range(13, 25, 3), ["_AFL.mp4", "_ARL.mp4"]),
+]
+
+# the filenames of each day's recordings without the date, in order, e.g. 091000_NF.mp4
+recording_time_suffixes = ["%02d%02d00%s" % (hour, minutes, suffix)
+                           for hour in [9, 18]
+                           for minutes_range, suffixes in recording_suffixes
+                           for minutes, suffix in itertools.product(minutes_range, suffixes)]
+
+
 def generate_recording_filenames(day_range=3, day_offset=0):
-    """procedurally generates deterministic recording filenames"""
+    """procedurally generates a list of deterministic recording filenames"""
     today = datetime.date.today() - datetime.timedelta(day_offset)
 
-    for date in [today - datetime.timedelta(day) for day in range(0, day_range)]:
-        for hour in [9, 18]:
-            for minutes in range(10, 25, 3):
-                for direction in ["F", "R"]:
-                    yield "%04d%02d%02d_%02d%02d%02d_N%s.mp4" % (date.year, date.month, date.day, hour, minutes, 0,
-                                                                 direction)
-            for minutes in range(11, 25, 3):
-                for direction in ["F", "R"]:
-                    yield "%04d%02d%02d_%02d%02d%02d_E%s.mp4" % (date.year, date.month, date.day, hour, minutes, 0,
-                                                                 direction)
-            for minutes in range(13, 25, 3):
-                for direction in ["F", "R"]:
-                    yield "%04d%02d%02d_%02d%02d%02d_A%sL.mp4" % (date.year, date.month, date.day, hour, minutes, 0,
-                                                                  direction)
+    # the date part of the filename is the same for all of a day's recordings
+    date_prefixes = [(today - datetime.timedelta(day)).strftime("%Y%m%d_") for day in range(0, day_range)]
+
+    return [date_prefix + time_suffix for date_prefix in date_prefixes for time_suffix in recording_time_suffixes]
+
+
+# the index of recordings only changes with the date, so it's rendered once a day: (date, index)
+vod_cache = (None, None)
 
 
 @app.route("/blackvue_vod.cgi", methods=['GET'])
 def vod():
     """returns the index of recordings"""
-    filenames = [filename for filename in generate_recording_filenames()]
-    return flask.render_template("vod.txt", filenames=filenames)
+    global vod_cache
+
+    today = datetime.date.today()
+    vod_date, vod_body = vod_cache
+
+    if vod_date != today:
+        filenames = generate_recording_filenames()
+        vod_body = flask.render_template("vod.txt", filenames=filenames).encode("utf-8")
+        vod_cache = (today, vod_body)
+
+    return flask.Response(vod_body)
+
+
+# represents a mock file served for recordings: contents, mime type and cache validators
+MockFile = namedtuple("MockFile", "data mimetype etag last_modified")
+
+
+def load_mock_file(extension):
+    """reads the mock file served for a given recording file extension"""
+    filename = "mock.%s" % extension
+    filepath = os.path.join(app.root_path, "files", filename)
+    with open(filepath, "rb") as mock_file:
+        data = mock_file.read()
+
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    last_modified = datetime.datetime.fromtimestamp(os.path.getmtime(filepath), datetime.timezone.utc)
+
+    return MockFile(data, mimetype, hashlib.sha1(data).hexdigest(), last_modified)
+
+
+# mock file served for each recording file extension; they're small enough to keep in memory
+mock_files = {extension: load_mock_file(extension) for extension in recording_extensions}
 
 
 @app.route("/Record/<filename>", methods=['GET'])
@@ -77,7 +131,11 @@ def record(filename):
     recording = to_recording(filename)
 
     if recording:
-        filepath = "files/mock.%s" % recording.extension
-        return flask.send_file(filepath)
+        mock_file = mock_files[recording.extension]
+        response = flask.Response(mock_file.data, mimetype=mock_file.mimetype)
+        response.set_etag(mock_file.etag)
+        response.last_modified = mock_file.last_modified
+        response.cache_control.no_cache = True
+        return response.make_conditional(flask.request, accept_ranges=True, complete_length=len(mock_file.data))
     else:
         return flask.abort(404)
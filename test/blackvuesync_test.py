@@ -2,10 +2,17 @@
 
 import pytest
 import datetime
+import functools
 
 import blackvuesync
 
 
+@functools.lru_cache(maxsize=None)
+def _parse(filename):
+    """parses a recording filename without grouping"""
+    return blackvuesync.to_recording(filename, "none")
+
+
 @pytest.mark.parametrize("filename, expected_recording", [
     ("20181029_131513_NF.mp4", blackvuesync.Recording("20181029_131513_NF.mp4", "20181029_131513", None,
                                                       datetime.datetime(2018, 10, 29, 13, 15, 13), "N", "F")),
@@ -72,6 +79,7 @@ def test_get_group_name(recording_datetime, expected_daily_group_name, expected_
     ("2d", datetime.datetime(2018, 10, 28)),
     ("1w", datetime.datetime(2018, 10, 23)),
     ("2w", datetime.datetime(2018, 10, 16)),
+    ("3", datetime.datetime(2018, 10, 27)),
 ])
 def test_calc_cutoff_date(keep, expected_cutoff_date):
     try:
@@ -84,6 +92,12 @@ def test_calc_cutoff_date(keep, expected_cutoff_date):
         blackvuesync.today = datetime.date.today()
 
 
+@pytest.mark.parametrize("keep", ["", "d", "w", "1m", "1dw", "-1d", "1.5d", "0", "0w"])
+def test_calc_cutoff_date_invalid(keep):
+    with pytest.raises(RuntimeError):
+        blackvuesync.calc_cutoff_date(keep)
+
+
 @pytest.mark.parametrize("priority, filenames, expected_sorted_filenames", [
     ("date",
      ["20190219_104220_NF.mp4", "20190219_104220_NR.mp4", "20190219_104619_MF.mp4", "20190219_104619_MR.mp4",
@@ -108,11 +122,44 @@ def test_calc_cutoff_date(keep, expected_cutoff_date):
       "20190219_223201_NF.mp4", "20190219_223201_NR.mp4", "20190219_224918_PF.mp4", "20190219_224918_PR.mp4"]),
 ])
 def test_sort_recordings(priority, filenames, expected_sorted_filenames):
-    recordings = [blackvuesync.to_recording(f, "none") for f in filenames]
-    expected_sorted_recordings = [blackvuesync.to_recording(f, "none") for f in expected_sorted_filenames]
+    recordings = [_parse(f) for f in filenames]
+    expected_sorted_recordings = [_parse(f) for f in expected_sorted_filenames]
 
     # copy
     sorted_recordings = recordings.copy()
     blackvuesync.sort_recordings(sorted_recordings, priority)
 
     assert expected_sorted_recordings == sorted_recordings
+
+
+@pytest.mark.parametrize("cutoff_date, filenames, expected_current_filenames", [
+    (None, ["20181028_235959_NF.mp4", "20181029_000000_NF.mp4"], ["20181028_235959_NF.mp4", "20181029_000000_NF.mp4"]),
+    (datetime.date(2018, 10, 29), ["20181028_235959_NF.mp4", "20181029_000000_NF.mp4", "20181030_120000_NF.mp4"],
+     ["20181029_000000_NF.mp4", "20181030_120000_NF.mp4"]),
+])
+def test_get_current_recordings(cutoff_date, filenames, expected_current_filenames):
+    try:
+        blackvuesync.cutoff_date = cutoff_date
+
+        recordings = [_parse(f) for f in filenames]
+        expected_current_recordings = [_parse(f) for f in expected_current_filenames]
+
+        assert expected_current_recordings == blackvuesync.get_current_recordings(recordings)
+    finally:
+        blackvuesync.cutoff_date = None
+
+
+@pytest.mark.parametrize("recording_filter, filenames, expected_filtered_filenames", [
+    (None, ["20190219_104220_NF.mp4", "20190219_104220_NR.mp4"], ["20190219_104220_NF.mp4", "20190219_104220_NR.mp4"]),
+    (["PF", "PR"],
+     ["20190219_104220_NF.mp4", "20190219_104220_NR.mp4", "20190219_224918_PF.mp4", "20190219_224918_PR.mp4"],
+     ["20190219_224918_PF.mp4", "20190219_224918_PR.mp4"]),
+    (["NR", "EF"],
+     ["20190219_104220_NF.mp4", "20190219_104220_NR.mp4", "20190224_172246_EF.mp4", "20190224_172246_ER.mp4"],
+     ["20190219_104220_NR.mp4", "20190224_172246_EF.mp4"]),
+])
+def test_get_filtered_recordings(recording_filter, filenames, expected_filtered_filenames):
+    recordings = [_parse(f) for f in filenames]
+    expected_filtered_recordings = [_parse(f) for f in expected_filtered_filenames]
+
+    assert expected_filtered_recordings == blackvuesync.get_filtered_recordings(recordings, recording_filter)